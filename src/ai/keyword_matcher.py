@@ -0,0 +1,42 @@
+"""
+Keyword Matcher - Busca de Palavras-Chave em Passada Única
+==========================================================
+
+Compila um conjunto de palavras-chave em um único autômato
+(Aho-Corasick, com fallback para regex) para detectar todas
+as ocorrências em uma só varredura do texto.
+"""
+
+import re
+from typing import Iterable, Set
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Autômato de palavras-chave compilado uma única vez."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keyword.lower() for keyword in keywords)
+
+        if ahocorasick:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            # Lookahead permite ocorrências sobrepostas, como o `in` original
+            self._automaton = None
+            self._pattern = re.compile(
+                "(?=(" + "|".join(re.escape(k) for k in self.keywords) + "))"
+            )
+
+    def matches(self, text: str) -> Set[str]:
+        """Retornar as palavras-chave presentes no texto (já em minúsculas)."""
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        return set(self._pattern.findall(text))
@@ -6,50 +6,104 @@ Coordena todos os modelos ONNX rodando na NPU para
 processamento simultâneo de áudio e análise.
 """
 
+import hashlib
 import logging
+import random
+import time
 import numpy as np
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any, Optional
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QTimer
 
 try:
     import onnxruntime as ort
 except ImportError:
     ort = None
 
+from .keyword_matcher import KeywordMatcher
 
-class NPUWorkerThread(QThread):
-    """Thread worker para processamento NPU."""
+
+# Palavras-chave de objeção, em ordem de prioridade
+OBJECTION_KEYWORDS = ("caro", "preço", "barato", "concorrente", "pensar")
+
+# Compilado uma única vez no carregamento do módulo
+_OBJECTION_MATCHER = KeywordMatcher(OBJECTION_KEYWORDS)
+
+
+@lru_cache(maxsize=1024)
+def _detect_objection_keyword(text_lower: str) -> Optional[str]:
+    """Obter a objeção de maior prioridade no texto (memoizado por texto)."""
+    found = _OBJECTION_MATCHER.matches(text_lower)
+    return next((k for k in OBJECTION_KEYWORDS if k in found), None)
+
+
+# Tipos ONNX -> numpy para as entradas de aquecimento
+_ONNX_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(int64)": np.int64,
+    "tensor(int32)": np.int32
+}
+
+# Falas e falantes usados no modo de demonstração
+_DEMO_TEXTS = (
+    "Estou interessado na sua solução",
+    "Qual é o preço do sistema?",
+    "Preciso conversar com minha equipe",
+    "Isso parece interessante"
+)
+_DEMO_SPEAKERS = ("vendor", "client")
+
+# Resultados simulados por modelo (até a inferência real ser implementada)
+_SIMULATED_RESULTS = {
+    "whisper": {
+        "text": "Texto transcrito de exemplo",
+        "confidence": 0.95,
+        "speaker_id": "vendor"
+    },
+    "sentiment": {
+        "sentiment": 0.72,
+        "emotion": "positive",
+        "engagement": 0.85
+    }
+}
+
+
+class NPUWorkerSignals(QObject):
+    """Sinais emitidos pelos workers NPU."""
     
     result_ready = pyqtSignal(str, dict)  # model_name, result
+
+
+class NPUWorker(QRunnable):
+    """Worker para processamento NPU executado no QThreadPool."""
     
-    def __init__(self, model_name: str, model_path: str, input_data: Any):
+    def __init__(self, model_name: str, session: Any, io_names: tuple, input_data: Any):
         super().__init__()
         self.model_name = model_name
-        self.model_path = model_path
+        self.session = session
+        self.input_names, self.output_names = io_names
         self.input_data = input_data
-        self.session = None
+        self.signals = NPUWorkerSignals()
+        self.is_aborted = False
+    
+    def abort(self):
+        """Cancelar o worker; o resultado não será emitido."""
+        self.is_aborted = True
     
     def run(self):
         """Executar inferência na NPU."""
+        if self.is_aborted:
+            return
+        
         try:
             # TODO: Implementar inferência real
             # Por enquanto, simular resultado
-            if self.model_name == "whisper":
-                result = {
-                    "text": "Texto transcrito de exemplo",
-                    "confidence": 0.95,
-                    "speaker_id": "vendor"
-                }
-            elif self.model_name == "sentiment":
-                result = {
-                    "sentiment": 0.72,
-                    "emotion": "positive",
-                    "engagement": 0.85
-                }
-            else:
-                result = {"status": "processed"}
+            result = dict(_SIMULATED_RESULTS.get(self.model_name, {"status": "processed"}))
             
-            self.result_ready.emit(self.model_name, result)
+            if not self.is_aborted:
+                self.signals.result_ready.emit(self.model_name, result)
             
         except Exception as e:
             logging.error(f"Erro no worker NPU {self.model_name}: {e}")
@@ -64,6 +118,17 @@ class NPUManager(QObject):
     objection_detected = pyqtSignal(str, list) # objeção, sugestões
     npu_status_changed = pyqtSignal(str)        # status
     
+    # Modelos gerenciados -> nome do arquivo ONNX (sem extensão)
+    _MODEL_FILES = {
+        "whisper": "whisper-base",
+        "sentiment": "distilbert-sentiment",
+        "objection": "bert-objection",
+        "speaker": "ecapa-speaker"
+    }
+    
+    # Intervalo de agrupamento dos chunks de áudio antes da inferência
+    _BATCH_INTERVAL_MS = 100
+    
     def __init__(self, config):
         super().__init__()
         self.config = config
@@ -74,10 +139,23 @@ class NPUManager(QObject):
         self.available_providers = []
         self.loaded_models = {}
         self.active_workers = {}
+        self._model_io: Dict[str, tuple] = {}  # modelo -> (entradas, saídas)
+        
+        # Workers reutilizam as threads do pool em vez de criar uma QThread por chunk.
+        # Pool próprio: transcrição e sentimento rodam em paralelo sem disputar
+        # o pool global, limitado ao número de modelos simultâneos configurado.
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(config.ai.max_concurrent_models)
         
         # Timer para simular processamento contínuo
         self.processing_timer = QTimer()
         self.processing_timer.timeout.connect(self._simulate_processing)
+        
+        # Chunks de áudio acumulados entre duas passadas da pipeline
+        self._pending_chunks = []
+        self._last_audio_hash = None
+        self.batch_timer = QTimer()
+        self.batch_timer.timeout.connect(self._flush_audio_batch)
     
     def initialize(self):
         """Inicializar NPU e carregar modelos."""
@@ -117,29 +195,81 @@ class NPUManager(QObject):
     
     def _load_models(self):
         """Carregar modelos ONNX na NPU."""
-        models_to_load = {
-            "whisper": "whisper-base.onnx",
-            "sentiment": "distilbert-sentiment.onnx", 
-            "objection": "bert-objection.onnx",
-            "speaker": "ecapa-speaker.onnx"
-        }
+        # Preferir a NPU (QNN) e manter a CPU como fallback
+        providers = []
+        if "QNNExecutionProvider" in self.available_providers:
+            # Backend HTP: caminho INT8 da NPU Snapdragon
+            providers.append(("QNNExecutionProvider", {"backend_path": "QnnHtp.dll"}))
+        if "CPUExecutionProvider" in self.available_providers:
+            providers.append("CPUExecutionProvider")
+        
+        # Opções compartilhadas: vários modelos rodam ao mesmo tempo, então cada
+        # sessão usa poucas threads em vez de uma por núcleo
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = self.config.ai.intra_op_threads
+        session_options.inter_op_num_threads = 1
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        session_options.enable_mem_pattern = True
+        session_options.enable_cpu_mem_arena = True
         
-        for model_name, filename in models_to_load.items():
-            model_path = self.config.get_model_path(filename)
+        for model_name, filename in self._MODEL_FILES.items():
+            model_path = self._resolve_model_path(filename)
             
             if model_path.exists():
                 try:
-                    # TODO: Carregar modelo real
-                    # session = ort.InferenceSession(str(model_path), providers=...)
+                    session = ort.InferenceSession(
+                        str(model_path), sess_options=session_options, providers=providers
+                    )
+                    
+                    # Nomes de entrada/saída consultados uma única vez, fora do caminho de inferência
+                    self._model_io[model_name] = (
+                        tuple(i.name for i in session.get_inputs()),
+                        tuple(o.name for o in session.get_outputs())
+                    )
                     self.loaded_models[model_name] = {
                         "path": model_path,
+                        "session": session,
                         "status": "loaded"
                     }
-                    self.logger.info(f"✅ Modelo {model_name} carregado")
+                    self.logger.info(f"✅ Modelo {model_name} carregado ({model_path.name})")
                 except Exception as e:
                     self.logger.error(f"❌ Erro ao carregar {model_name}: {e}")
             else:
-                self.logger.warning(f"⚠️ Modelo {filename} não encontrado")
+                self.logger.warning(f"⚠️ Modelo {model_path.name} não encontrado")
+        
+        # Aquecer em segundo plano para initialize() retornar rápido
+        if any("session" in model for model in self.loaded_models.values()):
+            self.thread_pool.start(self._warmup_sessions)
+    
+    def _warmup_sessions(self):
+        """Executar uma inferência com entradas zeradas para compilar os kernels."""
+        for model_name, model in list(self.loaded_models.items()):
+            session = model.get("session")
+            if session is None:
+                continue
+            
+            try:
+                start = time.perf_counter()
+                feeds = {
+                    inp.name: np.zeros(
+                        tuple(d if isinstance(d, int) else 1 for d in inp.shape),
+                        dtype=_ONNX_DTYPES.get(inp.type, np.float32)
+                    )
+                    for inp in session.get_inputs()
+                }
+                session.run(None, feeds)
+                
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.logger.info(f"🔥 Modelo {model_name} aquecido em {elapsed_ms:.0f}ms")
+            except Exception as e:
+                self.logger.warning(f"⚠️ Erro ao aquecer {model_name}: {e}")
+    
+    def _resolve_model_path(self, filename: str) -> Path:
+        """Obter caminho do modelo, preferindo a variante quantizada INT8."""
+        int8_path = self.config.get_model_path(f"{filename}-int8")
+        if int8_path.exists():
+            return int8_path
+        return self.config.get_model_path(filename)
     
     def _enable_simulation_mode(self):
         """Habilitar modo de simulação."""
@@ -149,17 +279,31 @@ class NPUManager(QObject):
         
         # Simular modelos carregados
         self.loaded_models = {
-            "whisper": {"status": "simulated"},
-            "sentiment": {"status": "simulated"},
-            "objection": {"status": "simulated"},
-            "speaker": {"status": "simulated"}
+            model_name: {"status": "simulated"} for model_name in self._MODEL_FILES
         }
     
     def process_audio(self, audio_data: np.ndarray):
-        """Processar áudio através da pipeline NPU."""
+        """Enfileirar áudio para a pipeline NPU (processado em lotes)."""
         if not self.is_initialized:
             return
         
+        self._pending_chunks.append(audio_data)
+        if not self.batch_timer.isActive():
+            self.batch_timer.start(self._BATCH_INTERVAL_MS)
+    
+    def _flush_audio_batch(self):
+        """Processar os chunks acumulados em uma única passada pela pipeline."""
+        if not self._pending_chunks:
+            self.batch_timer.stop()
+            return
+        
+        # Chunks consecutivos do mesmo stream: concatenar em um único bloco
+        audio_data = np.concatenate(self._pending_chunks)
+        self._pending_chunks.clear()
+        
+        if self._should_skip_audio(audio_data):
+            return
+        
         try:
             # Iniciar processamento assíncrono para múltiplos modelos
             self._process_transcription(audio_data)
@@ -169,28 +313,45 @@ class NPUManager(QObject):
         except Exception as e:
             self.logger.error(f"Erro no processamento de áudio: {e}")
     
-    def _process_transcription(self, audio_data: np.ndarray):
-        """Processar transcrição via Whisper."""
-        if "whisper" not in self.loaded_models:
-            return
+    def _should_skip_audio(self, audio_data: np.ndarray) -> bool:
+        """Verificar se o bloco é silêncio ou repetição do anterior."""
+        # RMS sem alocar array temporário
+        rms = float(np.sqrt(np.dot(audio_data, audio_data) / max(audio_data.size, 1)))
+        if rms < self.config.audio.silence_threshold:
+            return True
         
-        # Criar worker thread para Whisper
-        worker = NPUWorkerThread("whisper", "", audio_data)
-        worker.result_ready.connect(self._handle_transcription_result)
-        worker.start()
+        # Hash rápido do buffer (sem cópia) para descartar blocos idênticos
+        audio_hash = hashlib.blake2b(audio_data, digest_size=8).digest()
+        if audio_hash == self._last_audio_hash:
+            return True
         
-        self.active_workers["whisper"] = worker
+        self._last_audio_hash = audio_hash
+        return False
+    
+    def _process_transcription(self, audio_data: np.ndarray):
+        """Processar transcrição via Whisper."""
+        self._start_worker("whisper", audio_data, self._handle_transcription_result)
     
     def _process_sentiment_analysis(self, audio_data: np.ndarray):
         """Processar análise de sentimento."""
-        if "sentiment" not in self.loaded_models:
+        self._start_worker("sentiment", audio_data, self._handle_sentiment_result)
+    
+    def _start_worker(self, model_name: str, audio_data: np.ndarray, handler):
+        """Enfileirar um worker NPU para o modelo, se estiver carregado."""
+        model = self.loaded_models.get(model_name)
+        if model is None:
             return
         
-        worker = NPUWorkerThread("sentiment", "", audio_data)
-        worker.result_ready.connect(self._handle_sentiment_result)
-        worker.start()
+        worker = NPUWorker(
+            model_name,
+            model.get("session"),
+            self._model_io.get(model_name, ((), ())),
+            audio_data
+        )
+        worker.signals.result_ready.connect(handler)
+        self.thread_pool.start(worker)
         
-        self.active_workers["sentiment"] = worker
+        self.active_workers[model_name] = worker
     
     def _process_objection_detection(self, audio_data: np.ndarray):
         """Processar detecção de objeções."""
@@ -219,43 +380,33 @@ class NPUManager(QObject):
     
     def _check_for_objections(self, text: str):
         """Verificar objeções no texto e sugerir respostas."""
-        objection_keywords = ["caro", "preço", "barato", "concorrente", "pensar"]
+        # Frases repetidas (saudações, objeções comuns) não são varridas de novo
+        keyword = _detect_objection_keyword(text.lower().strip())
+        if keyword is None:
+            return
         
-        text_lower = text.lower()
-        for keyword in objection_keywords:
-            if keyword in text_lower:
-                # Simular sugestões
-                suggestions = [
-                    {
-                        "text": f"Entendo sua preocupação sobre {keyword}. Vamos falar sobre o valor...",
-                        "confidence": 0.9,
-                        "category": "Objeção de Preço"
-                    },
-                    {
-                        "text": "Posso mostrar um case de sucesso similar ao seu...",
-                        "confidence": 0.85,
-                        "category": "Prova Social"
-                    }
-                ]
-                
-                self.objection_detected.emit(keyword, suggestions)
-                break
+        # Simular sugestões
+        suggestions = [
+            {
+                "text": f"Entendo sua preocupação sobre {keyword}. Vamos falar sobre o valor...",
+                "confidence": 0.9,
+                "category": "Objeção de Preço"
+            },
+            {
+                "text": "Posso mostrar um case de sucesso similar ao seu...",
+                "confidence": 0.85,
+                "category": "Prova Social"
+            }
+        ]
+        
+        self.objection_detected.emit(keyword, suggestions)
     
     def _simulate_processing(self):
         """Simular processamento contínuo para demo."""
         # Simular transcrição periódica
-        import random
-        
-        sample_texts = [
-            "Estou interessado na sua solução",
-            "Qual é o preço do sistema?",
-            "Preciso conversar com minha equipe",
-            "Isso parece interessante"
-        ]
-        
         if random.random() < 0.3:  # 30% chance
-            text = random.choice(sample_texts)
-            speaker = random.choice(["vendor", "client"])
+            text = random.choice(_DEMO_TEXTS)
+            speaker = random.choice(_DEMO_SPEAKERS)
             self.transcription_ready.emit(text, speaker)
     
     def start_demo_mode(self):
@@ -270,14 +421,19 @@ class NPUManager(QObject):
         """Limpar recursos da NPU."""
         self.logger.info("🔄 Limpando recursos NPU...")
         
-        # Parar workers ativos
+        # Cancelar workers ativos e descartar os que ainda estão na fila
         for worker in self.active_workers.values():
-            if worker.isRunning():
-                worker.quit()
-                worker.wait()
+            worker.abort()
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone()
         
+        self.batch_timer.stop()
+        self._pending_chunks.clear()
+        self._last_audio_hash = None
         self.active_workers.clear()
         self.loaded_models.clear()
+        self._model_io.clear()
+        _detect_objection_keyword.cache_clear()
         self.stop_demo_mode()
         
         self.logger.info("✅ NPU Manager finalizado")
@@ -95,11 +95,13 @@ class AudioCaptureThread(QThread):
                         exception_on_overflow=False
                     )
                     
-                    # Converter para numpy array
+                    # Converter para numpy array (view sem cópia dos bytes)
                     np_data = np.frombuffer(audio_data, dtype=np.int16)
                     
-                    # Normalizar para float32
-                    normalized_data = np_data.astype(np.float32) / 32768.0
+                    # Normalizar para float32 em uma única alocação.
+                    # Não reutilizar um buffer fixo: o array é entregue a outra
+                    # thread via sinal e ainda pode estar em uso.
+                    normalized_data = np.multiply(np_data, 1.0 / 32768.0, dtype=np.float32)
                     
                     # Emitir sinal com dados
                     self.audio_data_ready.emit(normalized_data)
@@ -140,9 +142,11 @@ class AudioCapture(QObject):
         self.capture_thread: Optional[AudioCaptureThread] = None
         self.is_capturing = False
         
-        # Buffer para acumular áudio
-        self.audio_buffer = []
+        # Buffer circular pré-alocado com os últimos segundos de áudio
         self.buffer_size = config.audio.sample_rate * 3  # 3 segundos
+        self.audio_buffer = np.zeros(self.buffer_size, dtype=np.float32)
+        self._buffer_pos = 0     # Próxima posição de escrita
+        self._buffer_filled = 0  # Amostras válidas no buffer
         
         # Timer para simulação (quando PyAudio não disponível)
         self.simulation_timer = QTimer()
@@ -243,15 +247,33 @@ class AudioCapture(QObject):
     def _handle_audio_data(self, audio_data: np.ndarray):
         """Processar dados de áudio recebidos."""
         # Adicionar ao buffer
-        self.audio_buffer.extend(audio_data)
-        
-        # Manter tamanho do buffer
-        if len(self.audio_buffer) > self.buffer_size:
-            self.audio_buffer = self.audio_buffer[-self.buffer_size:]
+        self._write_to_buffer(audio_data)
         
         # Emitir para processamento NPU
         self.audio_ready.emit(audio_data)
     
+    def _write_to_buffer(self, audio_data: np.ndarray):
+        """Escrever no buffer circular sem realocar memória."""
+        n = len(audio_data)
+        
+        if n >= self.buffer_size:
+            self.audio_buffer[:] = audio_data[-self.buffer_size:]
+            self._buffer_pos = 0
+            self._buffer_filled = self.buffer_size
+            return
+        
+        end = self._buffer_pos + n
+        if end <= self.buffer_size:
+            self.audio_buffer[self._buffer_pos:end] = audio_data
+        else:
+            # Dar a volta no final do buffer
+            split = self.buffer_size - self._buffer_pos
+            self.audio_buffer[self._buffer_pos:] = audio_data[:split]
+            self.audio_buffer[:n - split] = audio_data[split:]
+        
+        self._buffer_pos = end % self.buffer_size
+        self._buffer_filled = min(self._buffer_filled + n, self.buffer_size)
+    
     def _simulate_audio(self):
         """Simular dados de áudio para desenvolvimento."""
         # Gerar áudio sintético (ruído branco baixo)
@@ -262,12 +284,19 @@ class AudioCapture(QObject):
         self.audio_ready.emit(simulated_audio)
     
     def get_audio_buffer(self) -> np.ndarray:
-        """Obter buffer de áudio atual."""
-        return np.array(self.audio_buffer, dtype=np.float32)
+        """Obter buffer de áudio atual (em ordem cronológica)."""
+        if self._buffer_filled < self.buffer_size:
+            return self.audio_buffer[:self._buffer_filled].copy()
+        
+        return np.concatenate((
+            self.audio_buffer[self._buffer_pos:],
+            self.audio_buffer[:self._buffer_pos]
+        ))
     
     def clear_buffer(self):
         """Limpar buffer de áudio."""
-        self.audio_buffer.clear()
+        self._buffer_pos = 0
+        self._buffer_filled = 0
     
     def cleanup(self):
         """Limpar recursos."""
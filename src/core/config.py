@@ -20,14 +20,16 @@ class AudioConfig:
     channels: int = 1
     format: str = "int16"
     device_index: int = None  # Auto-detect
+    silence_threshold: float = 0.001  # RMS abaixo do qual o áudio não é processado
 
 
 @dataclass
 class AIConfig:
     """Configurações de IA e NPU."""
     use_npu: bool = True
-    model_precision: str = "fp16"  # fp16, fp32
+    model_precision: str = "fp16"  # fp16, fp32 (variantes "-int8.onnx" têm prioridade)
     max_concurrent_models: int = 5
+    intra_op_threads: int = 2  # Threads ONNX Runtime por sessão
     whisper_model: str = "whisper-base"
     sentiment_model: str = "distilbert-sentiment"
     
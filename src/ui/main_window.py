@@ -232,14 +232,6 @@ class MainWindow(QMainWindow):
         # Atualizar status
         self.update_npu_status("connected")
         
-    def _go_to_summary(self):
-        """Navegar para a tela de resumo."""
-        self.stacked_widget.setCurrentIndex(2)
-        
-        # Manter indicadores de status ocultos
-        self.npu_status_label.setVisible(False)
-        self.recording_indicator.setVisible(False)
-        
     def _go_to_start(self):
         """Navegar para a tela inicial."""
         self.stacked_widget.setCurrentIndex(0)